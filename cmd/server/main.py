@@ -1,20 +1,38 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+import asyncio
+import orjson
 import uvicorn
 import os
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from typing import Optional, Dict, Any, List
 
 from internal.agent.agent import ToolsAgent, AgentConfig
 from internal.tools.loader import ToolLoader
+from internal.tools.http_request import close_async_client
 
 # Load environment variables
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Each uvicorn worker builds its own agent, so conversation memory is
+    # per-worker; clients that rely on multi-turn state should pin to one
+    # worker or run with WORKERS=1
+    global agent
+    agent = create_agent()
+    yield
+    # Release pooled HTTP connections on shutdown
+    await close_async_client()
+
 app = FastAPI(
     title="Python Tools Agent",
     description="An extensible Python-based agent framework using LangChain",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 class ExecuteRequest(BaseModel):
@@ -46,6 +64,13 @@ class ExecuteResponse(BaseModel):
     result: ResultDetails
     debug: Optional[DebugInfo] = None
 
+class BatchRequest(BaseModel):
+    items: List[ExecuteRequest]
+    max_concurrency: int = 8
+
+class BatchResponse(BaseModel):
+    results: List[Dict[str, Any]]
+
 # Initialize the agent
 def create_agent():
     # Get configuration from environment
@@ -89,8 +114,8 @@ def create_agent():
     # Create and return the agent
     return ToolsAgent(config, tools, openai_api_key)
 
-# Create the agent instance
-agent = create_agent()
+# Populated by the lifespan hook once the worker starts
+agent: Optional[ToolsAgent] = None
 
 @app.post("/execute", response_model=ExecuteResponse)
 async def execute(request: ExecuteRequest):
@@ -103,6 +128,38 @@ async def execute(request: ExecuteRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/execute/stream")
+async def execute_stream(request: ExecuteRequest):
+    """Stream agent progress (tokens and tool events) as Server-Sent Events."""
+    async def event_stream():
+        async for event in agent.astream(request.input):
+            yield f"data: {orjson.dumps(event, default=str).decode()}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@app.post("/batch_execute", response_model=BatchResponse)
+async def batch_execute(request: BatchRequest):
+    """Execute a batch of inputs concurrently, each on a fresh agent."""
+    sem = asyncio.Semaphore(request.max_concurrency)
+
+    async def _bounded(item: ExecuteRequest) -> Dict[str, Any]:
+        # A fresh agent per item keeps conversation memory from
+        # cross-talking between unrelated inputs
+        async with sem:
+            return await create_agent().execute(item.input, debug=item.debug)
+
+    results = await asyncio.gather(
+        *(_bounded(item) for item in request.items),
+        return_exceptions=True
+    )
+    return {
+        "results": [
+            {"error": str(r)} if isinstance(r, Exception) else r
+            for r in results
+        ]
+    }
+
 @app.post("/reset")
 async def reset_memory():
     """Reset the agent's memory."""
@@ -112,7 +169,14 @@ async def reset_memory():
 def main():
     """Run the FastAPI server."""
     port = int(os.getenv("PORT", "8080"))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(
+        "cmd.server.main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WORKERS", "4"))
+    )
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,9 +1,108 @@
 from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+import asyncio
+import copy
+import functools
+import os
+import time
 from langchain.agents import initialize_agent, AgentType
+from langchain.globals import set_llm_cache
 from langchain_openai import ChatOpenAI
-from langchain.memory import ConversationBufferMemory
+from langchain.memory import ConversationTokenBufferMemory
+from langchain_community.cache import SQLiteCache
 from langchain_community.tools import BaseTool
+from openai import RateLimitError
 from pydantic import BaseModel
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+# Exact-match LLM cache shared by every agent in the process: identical
+# prompts (including history) skip the OpenAI round trip entirely
+set_llm_cache(SQLiteCache(database_path=os.getenv("LLM_CACHE_PATH", ".llm_cache.db")))
+
+class AsyncRateLimiter:
+    """Enforce a minimum interval between LLM request dispatches.
+
+    Smooths bursts of concurrent requests so they do not trip the
+    provider's rate limit in the first place; retries handle whatever
+    still slips through.
+    """
+
+    def __init__(self, requests_per_minute: float):
+        self._interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._lock = asyncio.Lock()
+        self._next_dispatch = 0.0
+
+    async def wait(self):
+        """Sleep until this caller's dispatch slot arrives."""
+        if not self._interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_dispatch - now
+            self._next_dispatch = max(now, self._next_dispatch) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+# Shared across all agents in the process; OPENAI_RPM=0 disables pacing
+_rate_limiter = AsyncRateLimiter(float(os.getenv("OPENAI_RPM", "0")))
+
+class RateLimitedChatOpenAI(ChatOpenAI):
+    """ChatOpenAI that paces dispatch and retries transient 429s."""
+
+    async def _agenerate(self, *args, **kwargs):
+        await _rate_limiter.wait()
+        async for attempt in AsyncRetrying(
+            wait=wait_exponential(min=1, max=30),
+            stop=stop_after_attempt(5),
+            retry=retry_if_exception_type(RateLimitError),
+            reraise=True
+        ):
+            with attempt:
+                return await super()._agenerate(*args, **kwargs)
+
+    async def _astream(self, *args, **kwargs):
+        # The streaming path (astream_events) bypasses _agenerate, so it
+        # needs the same pacing and retry. 429s surface while the stream
+        # is being established, i.e. on the first chunk; once the stream
+        # is live there is nothing left to retry.
+        await _rate_limiter.wait()
+        async for attempt in AsyncRetrying(
+            wait=wait_exponential(min=1, max=30),
+            stop=stop_after_attempt(5),
+            retry=retry_if_exception_type(RateLimitError),
+            reraise=True
+        ):
+            with attempt:
+                stream = super()._astream(*args, **kwargs).__aiter__()
+                has_first = False
+                try:
+                    first = await stream.__anext__()
+                    has_first = True
+                except StopAsyncIteration:
+                    pass
+            # Only relay the stream after a successful attempt; on a
+            # captured RateLimitError the loop takes the next attempt
+            if not attempt.retry_state.outcome.failed:
+                if has_first:
+                    yield first
+                    async for chunk in stream:
+                        yield chunk
+                return
+
+@functools.lru_cache(maxsize=None)
+def _get_shared_llm(openai_api_key: str, temperature: float) -> RateLimitedChatOpenAI:
+    """Return one LLM client per (key, temperature) combination.
+
+    Agents created per request (batch endpoint, streaming) would otherwise
+    each build a ChatOpenAI with its own HTTP client, paying a fresh TLS
+    handshake per call; sharing the instance keeps the underlying httpx
+    connection pool to api.openai.com warm across requests.
+    """
+    return RateLimitedChatOpenAI(
+        temperature=temperature,
+        openai_api_key=openai_api_key
+    )
 
 class AgentConfig(BaseModel):
     """Configuration for the Tools Agent."""
@@ -12,8 +111,44 @@ class AgentConfig(BaseModel):
     return_intermediate_steps: bool = True
     temperature: float = 0
     memory_key: str = "chat_history"
+    max_token_limit: int = 2000
+    response_cache_size: int = 128
+    # Any AgentType value; "openai-multi-functions" lets the model issue
+    # several tool calls per step, which the async executor dispatches
+    # concurrently instead of one after another
+    agent_type: str = AgentType.CONVERSATIONAL_REACT_DESCRIPTION.value
+    # Seconds before a single tool invocation is abandoned; 0 disables
+    tool_timeout: float = 60
     debug: bool = False
 
+class _TimeoutTool(BaseTool):
+    """Wrapper bounding a tool's async invocation with a timeout.
+
+    A hung tool would otherwise stall the whole agent step - and, for
+    multi-action agent types, every tool call dispatched alongside it.
+    """
+    inner: BaseTool
+    timeout: float
+
+    def _run(self, *args, **kwargs):
+        return self.inner._run(*args, **kwargs)
+
+    async def _arun(self, *args, **kwargs):
+        try:
+            return await asyncio.wait_for(self.inner._arun(*args, **kwargs), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return {"error": f"Tool {self.name} timed out after {self.timeout} seconds"}
+
+@dataclass(slots=True)
+class StepEntry:
+    """Compact fixed-layout record for one intermediate agent step."""
+    action: str
+    input: Any
+    output: Any
+    timestamp: Optional[str]
+    thought: Optional[str] = None
+    raw_log: Optional[str] = None
+
 class ToolsAgent:
     def __init__(
         self,
@@ -23,17 +158,35 @@ class ToolsAgent:
     ):
         """Initialize the Tools Agent with configuration and tools."""
         self.config = config
+
+        # Bound every tool call so one hung tool cannot stall the step
+        if config.tool_timeout:
+            tools = [
+                _TimeoutTool(
+                    name=tool.name,
+                    description=tool.description,
+                    args_schema=tool.args_schema,
+                    inner=tool,
+                    timeout=config.tool_timeout
+                )
+                for tool in tools
+            ]
         self.tools = tools
+
+        # LRU of (input, debug) -> full response dict; hits skip the LLM and tool
+        # round trips entirely. A hit also skips the memory update, trading
+        # perfect history for latency; cleared alongside the memory.
+        self._response_cache: OrderedDict = OrderedDict()
         
-        # Initialize the language model
-        self.llm = ChatOpenAI(
-            temperature=config.temperature,
-            openai_api_key=openai_api_key
-        )
+        # Initialize the language model, shared across agents so connection
+        # keep-alive to the API survives per-request agent construction
+        self.llm = _get_shared_llm(openai_api_key, config.temperature)
         
-        # Initialize memory
-        self.memory = ConversationBufferMemory(
+        # Initialize memory, bounded so prompt length stays flat over long sessions
+        self.memory = ConversationTokenBufferMemory(
+            llm=self.llm,
             memory_key=config.memory_key,
+            max_token_limit=config.max_token_limit,
             return_messages=True
         )
         
@@ -41,7 +194,7 @@ class ToolsAgent:
         self.agent = initialize_agent(
             tools=tools,
             llm=self.llm,
-            agent=AgentType.CONVERSATIONAL_REACT_DESCRIPTION,
+            agent=AgentType(config.agent_type),
             memory=self.memory,
             verbose=True,  # Always enable verbose for capturing steps
             max_iterations=config.max_iterations,
@@ -52,6 +205,15 @@ class ToolsAgent:
     
     async def execute(self, input_text: str, debug: bool = False) -> Dict[str, Any]:
         """Execute the agent with the given input."""
+        # Keyed on the debug flag too: the cached value is fully rendered,
+        # so a debug hit must never serve (or leak) a non-debug response
+        cache_key = (input_text, debug)
+        if self.config.response_cache_size:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                return copy.deepcopy(cached)
+
         try:
             # Run the agent with return_intermediate_steps=True and handle_parsing_errors=True
             agent_response = await self.agent.ainvoke(
@@ -76,50 +238,55 @@ class ToolsAgent:
                 }
             }
             
-            # Process steps
+            # Process steps into compact slotted records; debug parsing is
+            # done once per step
             if steps:
-                processed_steps = []
+                entries = []
                 for step in steps:
                     # Each step is a tuple of (action, observation)
                     action = step[0]
                     observation = step[1]
-                    
-                    step_entry = {
-                        "action": action.tool,
-                        "input": action.tool_input,
-                        "output": observation,
-                        "timestamp": action.timestamp if hasattr(action, "timestamp") else None
-                    }
-                    
+
+                    entry = StepEntry(
+                        action=action.tool,
+                        input=action.tool_input,
+                        output=observation,
+                        timestamp=action.timestamp if hasattr(action, "timestamp") else None
+                    )
+
                     # Add debug information if requested
                     if debug:
-                        step_entry.update({
-                            "thought": action.log.split("\nAction:")[0].replace("Thought: ", "").strip() if hasattr(action, "log") else None,
-                            "raw_log": action.log if hasattr(action, "log") else None
-                        })
-                    
-                    processed_steps.append(step_entry)
-                
-                response["result"]["steps"] = processed_steps
-                
+                        entry.raw_log = action.log if hasattr(action, "log") else None
+                        entry.thought = entry.raw_log.split("\nAction:")[0].replace("Thought: ", "").strip() if entry.raw_log is not None else None
+
+                    entries.append(entry)
+
+                # Convert to dicts only at the serialization boundary
+                response["result"]["steps"] = [asdict(entry) for entry in entries]
+
                 # Add debug information if requested
                 if debug:
                     response["debug"] = {
                         "final_thought": result,
-                        "total_steps": len(processed_steps),
+                        "total_steps": len(entries),
                         "raw_steps": [
                             {
-                                "thought": step[0].log.split("\nAction:")[0].replace("Thought: ", "").strip() if hasattr(step[0], "log") else None,
-                                "action": step[0].tool,
-                                "action_input": step[0].tool_input,
-                                "observation": step[1]
+                                "thought": entry.thought,
+                                "action": entry.action,
+                                "action_input": entry.input,
+                                "observation": entry.output
                             }
-                            for step in steps
+                            for entry in entries
                         ]
                     }
-            
+
+            if self.config.response_cache_size:
+                self._response_cache[cache_key] = copy.deepcopy(response)
+                while len(self._response_cache) > self.config.response_cache_size:
+                    self._response_cache.popitem(last=False)
+
             return response
-            
+
         except Exception as e:
             return {
                 "error": str(e),
@@ -129,6 +296,33 @@ class ToolsAgent:
                 } if debug else None
             }
     
+    async def astream(self, input_text: str):
+        """Yield token and tool events as the agent run progresses.
+
+        Events are plain dicts ready for SSE serialization: token chunks
+        from the chat model plus tool start/end markers, so clients see
+        output from the first LLM token instead of after the full run.
+        """
+        async for event in self.agent.astream_events({"input": input_text}, version="v2"):
+            kind = event.get("event")
+            if kind == "on_chat_model_stream":
+                content = getattr(event["data"].get("chunk"), "content", "")
+                if content:
+                    yield {"event": "token", "content": content}
+            elif kind == "on_tool_start":
+                yield {
+                    "event": "tool_start",
+                    "name": event.get("name"),
+                    "input": event["data"].get("input")
+                }
+            elif kind == "on_tool_end":
+                yield {
+                    "event": "tool_end",
+                    "name": event.get("name"),
+                    "output": event["data"].get("output")
+                }
+
     def reset_memory(self):
-        """Reset the agent's memory."""
-        self.memory.clear() 
\ No newline at end of file
+        """Reset the agent's memory and cached responses."""
+        self.memory.clear()
+        self._response_cache.clear() 
\ No newline at end of file
@@ -1,12 +1,51 @@
 from langchain_community.tools import BaseTool
 from pydantic import BaseModel, Field
+import ast
+import functools
 import operator
-from typing import Optional, Dict, Any, Literal, ClassVar
+from typing import Optional, Dict, Any, List, Literal, ClassVar
 import json
+import orjson
+
+# AST nodes permitted in string expressions: the four advertised
+# operations only. Notably no ast.Pow - a tiny input like 9**9**8 burns
+# minutes of uninterruptible big-int CPU on the event loop.
+_ALLOWED_EXPR_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div,
+    ast.UAdd, ast.USub
+)
+
+@functools.lru_cache(maxsize=256)
+def _compile_expression(expr: str):
+    """Parse and compile a math expression to a reusable code object.
+
+    Only arithmetic nodes and numeric constants are allowed, so the
+    resulting bytecode is safe to eval with empty builtins. Compiled
+    expressions are memoized since agents often retry the same input.
+    """
+    tree = ast.parse(expr, mode='eval')
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_EXPR_NODES):
+            raise ValueError(f"Unsupported expression element: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError("Only numeric constants are allowed")
+    return compile(tree, '<expression>', 'eval')
+
+def _evaluate_expression(expr: str) -> float:
+    """Evaluate a math expression string via its compiled bytecode."""
+    try:
+        return float(eval(_compile_expression(expr), {"__builtins__": {}}, {}))
+    except ZeroDivisionError:
+        raise ValueError("Division by zero")
+    except OverflowError:
+        raise ValueError("Result too large to represent")
+    except SyntaxError:
+        raise ValueError(f"Invalid expression: {expr}")
 
 class CalculatorInput(BaseModel):
     """Input for Calculator Tool."""
-    tool_input: str = Field(description="A JSON string containing operation, a, and b values")
+    tool_input: str = Field(description="A JSON string containing operation, a, and b values, or an expression string")
 
 class CalculatorTool(BaseTool):
     name: str = "calculator"
@@ -14,8 +53,10 @@ class CalculatorTool(BaseTool):
     The input should be a JSON string with three fields:
     - operation: one of "add", "subtract", "multiply", "divide"
     - a: first number or a nested operation
-    - b: second number or a nested operation"""
-    
+    - b: second number or a nested operation
+    Alternatively, a JSON string with a single "expression" field holding
+    a math expression such as "(15 / 3) * 4"."""
+
     args_schema: type[CalculatorInput] = CalculatorInput
 
     operations: ClassVar[Dict[str, Any]] = {
@@ -25,49 +66,70 @@ class CalculatorTool(BaseTool):
         "divide": operator.truediv
     }
 
-    def _evaluate_operand(self, operand: Any) -> float:
-        """Evaluate an operand which could be a number or a nested operation."""
-        if isinstance(operand, dict):
-            # Handle nested operation
-            operation = operand.get("operation")
-            a = self._evaluate_operand(operand.get("a"))
-            b = self._evaluate_operand(operand.get("b"))
-            
-            if operation not in self.operations:
-                raise ValueError(f"Unknown operation: {operation}")
-            
-            if operation == "divide" and b == 0:
-                raise ValueError("Division by zero")
-            
-            return self.operations[operation](a, b)
-        else:
-            # Handle direct number
-            return float(operand)
+    def _flatten_operand(self, operand: Any) -> List[Any]:
+        """Flatten a nested operation tree into a postfix token list."""
+        tokens = []
+        stack = [operand]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, tuple):
+                # Operator marker emitted after both of its operands
+                tokens.append(node)
+            elif isinstance(node, dict):
+                operation = node.get("operation")
+                if operation not in self.operations:
+                    raise ValueError(f"Unknown operation: {operation}")
+                # Pushed in reverse so a's subtree is emitted first
+                stack.append(("op", operation))
+                stack.append(node.get("b"))
+                stack.append(node.get("a"))
+            else:
+                tokens.append(float(node))
+        return tokens
+
+    def _evaluate_postfix(self, tokens: List[Any]) -> float:
+        """Evaluate a postfix token list with a value stack (no recursion)."""
+        stack: List[float] = []
+        for token in tokens:
+            if isinstance(token, tuple):
+                b = stack.pop()
+                a = stack.pop()
+                operation = token[1]
+                if operation == "divide" and b == 0:
+                    raise ValueError("Division by zero")
+                stack.append(self.operations[operation](a, b))
+            else:
+                stack.append(token)
+        return stack[-1]
 
     def _run(self, tool_input: str) -> Dict[str, Any]:
         """Execute the calculator operation."""
         try:
             # Parse the input JSON
-            params = json.loads(tool_input)
+            params = orjson.loads(tool_input)
+
+            # Expression form: compile once and evaluate the bytecode
+            if isinstance(params, dict) and "expression" in params:
+                return {"result": _evaluate_expression(params["expression"])}
+
             operation = params["operation"]
-            
+
             if operation not in self.operations:
                 raise ValueError(f"Unknown operation: {operation}")
-            
-            # Evaluate both operands which could be numbers or nested operations
-            a = self._evaluate_operand(params["a"])
-            b = self._evaluate_operand(params["b"])
-            
-            if operation == "divide" and b == 0:
-                raise ValueError("Division by zero")
-            
-            result = self.operations[operation](a, b)
+
+            # Flatten the (possibly nested) operation tree and evaluate
+            # it iteratively instead of recursing per node
+            result = self._evaluate_postfix(self._flatten_operand(params))
             return {"result": result}
         except json.JSONDecodeError:
-            return {"error": "Invalid JSON input"}
-        except (KeyError, ValueError) as e:
+            # Fall back to treating the raw input as a math expression
+            try:
+                return {"result": _evaluate_expression(tool_input)}
+            except (ValueError, SyntaxError):
+                return {"error": "Invalid JSON input"}
+        except (KeyError, ValueError, TypeError) as e:
             return {"error": str(e)}
 
     async def _arun(self, tool_input: str) -> Dict[str, Any]:
         """Execute the calculator operation asynchronously."""
-        return self._run(tool_input) 
\ No newline at end of file
+        return self._run(tool_input)
@@ -1,13 +1,48 @@
 from langchain_community.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import Dict, Any, Optional, List
+import ast
+import asyncio
+import base64
+import functools
+import marshal
 import subprocess
-import tempfile
+import struct
 import os
 import json
+import orjson
 import sys
 import shutil
 
+# Script each pool worker runs; lives next to this module
+_WORKER_RUNTIME = os.path.join(os.path.dirname(__file__), 'worker_runtime.py')
+
+# Only these host variables are inherited by executed code; keeping the
+# child env small speeds up execve and avoids leaking secrets from the
+# host environment into snippets
+_ALLOWED_ENV_VARS = {"PATH", "HOME", "LANG", "LC_ALL", "TMPDIR"}
+
+@functools.lru_cache(maxsize=256)
+def _validate_and_compile(code: str, allowed_modules: tuple) -> tuple:
+    """Parse, import-check, and compile a snippet once per unique code string.
+
+    Returns (ok, bytecode) where bytecode is the marshalled code object,
+    ready to ship to a pool worker so it can skip the parse/compile step.
+    Agent retry loops resubmit identical snippets often, so the verdict
+    and bytecode are memoized.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return (False, None)
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            for name in node.names:
+                module = name.name.split('.')[0]
+                if module not in allowed_modules:
+                    return (False, None)
+    return (True, marshal.dumps(compile(code, '<snippet>', 'exec')))
+
 class CodeExecutionInput(BaseModel):
     """Input for Code Execution Tool."""
     tool_input: str = Field(description="A JSON string containing code, language, and optional timeout")
@@ -20,6 +55,63 @@ class CodeExecutionConfig(BaseModel):
     disable_subprocess: bool = True
     disable_file_access: bool = True
     disable_network_access: bool = True
+    worker_pool_size: int = 2
+
+class _WorkerPool:
+    """Pool of pre-warmed Python worker subprocesses.
+
+    Each worker runs worker_runtime.py and stays alive between jobs, so
+    repeated executions skip interpreter startup. Jobs are dispatched to
+    whichever worker is idle; a worker that times out or dies is killed
+    and replaced.
+    """
+
+    def __init__(self, python_executable: str, size: int, env: Dict[str, str]):
+        self._python_executable = python_executable
+        self._env = env
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(self._spawn())
+
+    def _spawn(self) -> subprocess.Popen:
+        """Start a fresh worker process."""
+        return subprocess.Popen(
+            [self._python_executable, '-u', _WORKER_RUNTIME],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=self._env
+        )
+
+    def _dispatch(self, worker: subprocess.Popen, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one job to a worker and read back its result (blocking)."""
+        payload = orjson.dumps(job)
+        worker.stdin.write(struct.pack('>I', len(payload)) + payload)
+        worker.stdin.flush()
+        header = worker.stdout.read(4)
+        if len(header) < 4:
+            raise RuntimeError("Worker exited unexpectedly")
+        (length,) = struct.unpack('>I', header)
+        return orjson.loads(worker.stdout.read(length))
+
+    async def run(self, job: Dict[str, Any], timeout: int) -> Dict[str, Any]:
+        """Run a job on an idle worker, respawning it on timeout or failure."""
+        worker = await self._idle.get()
+        if worker.poll() is not None:
+            worker = self._spawn()
+        try:
+            result = await asyncio.wait_for(
+                asyncio.to_thread(self._dispatch, worker, job),
+                timeout=timeout
+            )
+        except BaseException:
+            # The worker is in an unknown state; kill it and replace it
+            worker.kill()
+            worker.wait()
+            self._idle.put_nowait(self._spawn())
+            raise
+        self._idle.put_nowait(worker)
+        return result
 
 class CodeExecutionTool(BaseTool):
     name: str = "code_execution"
@@ -34,7 +126,13 @@ class CodeExecutionTool(BaseTool):
     # Tool configuration
     config: CodeExecutionConfig = Field(default_factory=CodeExecutionConfig)
     python_executable: str = Field(default_factory=lambda: sys.executable)
-    
+
+    # Worker pool is created lazily on first async execution
+    _worker_pool: Optional[_WorkerPool] = PrivateAttr(default=None)
+
+    # Allowlisted host environment, computed once at init
+    _base_env: Dict[str, str] = PrivateAttr(default_factory=dict)
+
     def __init__(self, **kwargs):
         # Extract configuration parameters
         config_params = {
@@ -43,7 +141,8 @@ class CodeExecutionTool(BaseTool):
             'allowed_modules': kwargs.pop('allowed_modules', ['math', 'numpy', 'pandas']),
             'disable_subprocess': kwargs.pop('disable_subprocess', True),
             'disable_file_access': kwargs.pop('disable_file_access', True),
-            'disable_network_access': kwargs.pop('disable_network_access', True)
+            'disable_network_access': kwargs.pop('disable_network_access', True),
+            'worker_pool_size': kwargs.pop('worker_pool_size', 2)
         }
         
         # Initialize parent class
@@ -54,6 +153,9 @@ class CodeExecutionTool(BaseTool):
         
         # Find Python executable
         self.python_executable = self._get_python_executable()
+
+        # Precompute the allowlisted base environment for subprocesses
+        self._base_env = {k: v for k, v in os.environ.items() if k in _ALLOWED_ENV_VARS}
     
     def _get_python_executable(self) -> str:
         """Get the Python executable path."""
@@ -69,26 +171,42 @@ class CodeExecutionTool(BaseTool):
         
         raise ValueError("Could not find Python executable")
 
+    def _subprocess_env(self) -> Dict[str, str]:
+        """Build the environment for executing code in a subprocess."""
+        return {
+            **self._base_env,
+            'PYTHONPATH': os.getcwd(),  # Add current directory to Python path
+            'MALLOC_ARENA_MAX': '2',  # Limit memory fragmentation
+            'PYTHONMALLOC': 'malloc',  # Use system malloc
+            'PYTHONIOENCODING': 'utf-8'  # Ensure proper encoding
+        }
+
+    def _ensure_output(self, code: str) -> str:
+        """Append a print statement if the code produces no output itself."""
+        if not any(line.strip().startswith('print(') for line in code.splitlines()):
+            code += "\nprint(result)"
+        return code
+
+    def _get_worker_pool(self) -> _WorkerPool:
+        """Return the worker pool, creating it on first use."""
+        if self._worker_pool is None:
+            self._worker_pool = _WorkerPool(
+                python_executable=self.python_executable,
+                size=self.config.worker_pool_size,
+                env=self._subprocess_env()
+            )
+        return self._worker_pool
+
     def _validate_imports(self, code: str) -> bool:
         """Validate that only allowed modules are imported."""
-        import ast
-        try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.Import, ast.ImportFrom)):
-                    for name in node.names:
-                        module = name.name.split('.')[0]
-                        if module not in self.config.allowed_modules:
-                            return False
-            return True
-        except:
-            return False
+        ok, _ = _validate_and_compile(code, tuple(self.config.allowed_modules))
+        return ok
 
     def _run(self, tool_input: str) -> Dict[str, Any]:
         """Execute the code snippet."""
         try:
             # Parse the input JSON
-            params = json.loads(tool_input)
+            params = orjson.loads(tool_input)
             code = params["code"]
             timeout = int(params.get("timeout", self.config.timeout))
 
@@ -99,29 +217,17 @@ class CodeExecutionTool(BaseTool):
                 }
 
             try:
-                # Create a temporary file
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-                    # Add print statement if the code doesn't have one
-                    if not any(line.strip().startswith('print(') for line in code.splitlines()):
-                        code += "\nprint(result)"
-                    
-                    temp_file.write(code)
-                    temp_file_path = temp_file.name
+                code = self._ensure_output(code)
 
                 try:
-                    # Execute the code with resource limits
+                    # Pipe the code via stdin; no temp file round trip
                     result = subprocess.run(
-                        [self.python_executable, temp_file_path],
+                        [self.python_executable, '-'],
+                        input=code,
                         capture_output=True,
                         text=True,
                         timeout=timeout,
-                        env={
-                            **os.environ,
-                            'PYTHONPATH': os.getcwd(),  # Add current directory to Python path
-                            'MALLOC_ARENA_MAX': '2',  # Limit memory fragmentation
-                            'PYTHONMALLOC': 'malloc',  # Use system malloc
-                            'PYTHONIOENCODING': 'utf-8'  # Ensure proper encoding
-                        }
+                        env=self._subprocess_env()
                     )
 
                     response = {
@@ -144,12 +250,6 @@ class CodeExecutionTool(BaseTool):
                         "stderr": e.stderr,
                         "exit_code": e.returncode
                     }
-                finally:
-                    # Clean up the temporary file
-                    try:
-                        os.unlink(temp_file_path)
-                    except:
-                        pass
 
             except Exception as e:
                 return {"error": f"Execution error: {str(e)}"}
@@ -160,5 +260,45 @@ class CodeExecutionTool(BaseTool):
             return {"error": str(e)}
 
     async def _arun(self, tool_input: str) -> Dict[str, Any]:
-        """Execute the code snippet asynchronously."""
-        return self._run(tool_input) 
\ No newline at end of file
+        """Execute the code snippet on a pre-warmed pool worker."""
+        try:
+            # Parse the input JSON
+            params = orjson.loads(tool_input)
+            code = params["code"]
+            timeout = int(params.get("timeout", self.config.timeout))
+
+            # Validate imports and compile once; the worker reuses the bytecode
+            code = self._ensure_output(code)
+            ok, bytecode = _validate_and_compile(code, tuple(self.config.allowed_modules))
+            if not ok:
+                return {
+                    "error": f"Code contains unauthorized imports. Allowed modules: {', '.join(self.config.allowed_modules)}"
+                }
+
+            job = {
+                "code": code,
+                "bytecode": base64.b64encode(bytecode).decode('ascii')
+            }
+
+            try:
+                result = await self._get_worker_pool().run(job, timeout)
+            except asyncio.TimeoutError:
+                return {
+                    "error": f"Code execution timed out after {timeout} seconds"
+                }
+            except Exception as e:
+                return {"error": f"Execution error: {str(e)}"}
+
+            response = {
+                "stdout": result["stdout"].strip() if result.get("stdout") else None,
+                "stderr": result["stderr"].strip() if result.get("stderr") else None,
+                "exit_code": result.get("exit_code", 0)
+            }
+
+            # Only include non-empty fields
+            return {k: v for k, v in response.items() if v is not None}
+
+        except json.JSONDecodeError:
+            return {"error": "Invalid JSON input"}
+        except (KeyError, ValueError) as e:
+            return {"error": str(e)} 
\ No newline at end of file
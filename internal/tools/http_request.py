@@ -1,8 +1,27 @@
 from langchain_community.tools import BaseTool
 from pydantic import BaseModel, HttpUrl, Field
 from typing import Optional, Dict, Any, ClassVar
-import requests
+import httpx
+import os
 import json
+import orjson
+
+# Cap on how much of a response body is materialized; anything beyond is
+# truncated to a preview so huge payloads cannot bloat memory or the LLM
+# context downstream
+_MAX_RESPONSE_BYTES = int(os.getenv("HTTP_TOOL_MAX_BYTES", str(256 * 1024)))
+
+# Shared async client so concurrent tool calls reuse pooled keep-alive
+# connections instead of paying a new TCP/TLS handshake per request.
+_async_client = httpx.AsyncClient(
+    http2=True,
+    timeout=30.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+)
+
+async def close_async_client():
+    """Close the shared HTTP client. Called on server shutdown."""
+    await _async_client.aclose()
 
 class HTTPRequestInput(BaseModel):
     """Input for HTTP Request Tool."""
@@ -21,9 +40,13 @@ class HTTPRequestTool(BaseTool):
 
     def _run(self, tool_input: str) -> Dict[str, Any]:
         """Execute the HTTP request."""
+        # Only the sync fallback needs requests; import it lazily so server
+        # cold-start pays for httpx alone
+        import requests
+
         try:
             # Parse the input JSON
-            params = json.loads(tool_input)
+            params = orjson.loads(tool_input)
             method = params["method"].upper()
             url = params["url"]
             headers = params.get("headers", {})
@@ -54,5 +77,57 @@ class HTTPRequestTool(BaseTool):
             return {"error": str(e)}
 
     async def _arun(self, tool_input: str) -> Dict[str, Any]:
-        """Execute the HTTP request asynchronously."""
-        return self._run(tool_input) 
\ No newline at end of file
+        """Execute the HTTP request asynchronously without blocking the event loop."""
+        try:
+            # Parse the input JSON
+            params = orjson.loads(tool_input)
+            method = params["method"].upper()
+            url = params["url"]
+            headers = params.get("headers", {})
+            body = params.get("body")
+
+            if method not in ["GET", "POST", "PUT", "DELETE"]:
+                raise ValueError(f"Unsupported HTTP method: {method}")
+
+            try:
+                async with _async_client.stream(
+                    method=method,
+                    url=str(url),
+                    headers=headers or {},
+                    json=body if body else None
+                ) as response:
+                    # Read incrementally and stop once the cap is exceeded
+                    chunks = []
+                    total = 0
+                    truncated = False
+                    async for chunk in response.aiter_bytes():
+                        chunks.append(chunk)
+                        total += len(chunk)
+                        if total > _MAX_RESPONSE_BYTES:
+                            truncated = True
+                            break
+                    data = b"".join(chunks)
+
+                result = {
+                    "status_code": response.status_code,
+                    "headers": dict(response.headers)
+                }
+                encoding = response.encoding or "utf-8"
+                if truncated:
+                    result["body_truncated"] = True
+                    result["preview"] = data[:_MAX_RESPONSE_BYTES].decode(encoding, errors="replace")
+                elif response.headers.get("content-type", "").startswith("application/json"):
+                    try:
+                        result["body"] = orjson.loads(data)
+                    except orjson.JSONDecodeError:
+                        result["body"] = data.decode(encoding, errors="replace")
+                else:
+                    result["body"] = data.decode(encoding, errors="replace")
+                return result
+
+            except httpx.HTTPError as e:
+                return {"error": str(e)}
+        except json.JSONDecodeError:
+            return {"error": "Invalid JSON input"}
+        except (KeyError, ValueError) as e:
+            return {"error": str(e)} 
\ No newline at end of file
@@ -1,5 +1,6 @@
 from typing import Dict, Any, List, Type
-import yaml
+import functools
+import os
 import importlib
 from pathlib import Path
 from pydantic import BaseModel
@@ -15,19 +16,30 @@ class ToolsConfig(BaseModel):
     """Configuration for all tools."""
     tools: Dict[str, ToolConfig]
 
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(config_path: str, mtime: float) -> ToolsConfig:
+    """Parse a YAML config file; the mtime key invalidates the cache on edits."""
+    # Imported lazily: parses are rare thanks to the cache, and deferring
+    # the import trims server cold-start
+    import yaml
+
+    with open(config_path, 'r') as f:
+        config_data = yaml.safe_load(f)
+        return ToolsConfig(**config_data)
+
 class ToolLoader:
     """Loader for tool configurations."""
     
     @staticmethod
     def load_config(config_path: str) -> ToolsConfig:
-        """Load tool configurations from a YAML file."""
-        with open(config_path, 'r') as f:
-            config_data = yaml.safe_load(f)
-            return ToolsConfig(**config_data)
-    
+        """Load tool configurations from a YAML file, cached until the file changes."""
+        path = os.path.abspath(config_path)
+        return _load_config_cached(path, os.stat(path).st_mtime)
+
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def import_class(class_path: str) -> Type:
-        """Import a class from a string path."""
+        """Import a class from a string path; cached since paths are immutable in-process."""
         module_path, class_name = class_path.rsplit('.', 1)
         module = importlib.import_module(module_path)
         return getattr(module, class_name)
@@ -1,8 +1,82 @@
 from langchain_community.tools import BaseTool
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional
-import wikipedia
+import asyncio
+import copy
+import threading
 import json
+import orjson
+from cachetools import TTLCache
+
+# wikipedia.set_lang mutates process-global state, so the set_lang + fetch
+# sequence must not interleave across concurrent lookups. The lookups run in
+# worker threads (see _arun), hence a threading.Lock rather than asyncio.Lock.
+_language_lock = threading.Lock()
+
+# Agents frequently repeat the same searches across turns, and each lookup
+# costs 2-3 HTTPS round trips. Cache assembled responses keyed on
+# (language, query); failed lookups are cached too, but for a shorter TTL
+# so transient errors and new articles are retried sooner.
+_page_cache: TTLCache = TTLCache(maxsize=512, ttl=3600)
+_negative_cache: TTLCache = TTLCache(maxsize=512, ttl=300)
+_cache_lock = threading.Lock()
+
+def _lookup(language: str, query: str) -> Dict[str, Any]:
+    """Fetch a Wikipedia page, consulting the response caches first."""
+    # Imported lazily to keep server cold-start fast; after the first call
+    # this is just a sys.modules lookup
+    import wikipedia
+
+    key = (language, query)
+    with _cache_lock:
+        if key in _page_cache:
+            return _page_cache[key]
+        if key in _negative_cache:
+            return _negative_cache[key]
+
+    try:
+        with _language_lock:
+            # Set the language
+            wikipedia.set_lang(language)
+
+            # Search for the page
+            search_results = wikipedia.search(query)
+            if not search_results:
+                result = {
+                    "error": f"No Wikipedia articles found for: {query}"
+                }
+            else:
+                # Get the first result
+                page_title = search_results[0]
+                page = wikipedia.page(page_title, auto_suggest=False)
+
+                result = {
+                    "title": page.title,
+                    "url": page.url,
+                    "extract": page.summary,
+                    "page_id": page.pageid
+                }
+
+    except wikipedia.exceptions.DisambiguationError as e:
+        result = {
+            "error": "Disambiguation page",
+            "options": e.options[:5]  # Return first 5 options
+        }
+    except wikipedia.exceptions.PageError:
+        result = {
+            "error": f"No Wikipedia page found for: {query}"
+        }
+    except Exception as e:
+        # Network or parse failures are not cached at all
+        return {"error": str(e)}
+
+    with _cache_lock:
+        if "error" in result:
+            _negative_cache[key] = result
+        else:
+            _page_cache[key] = result
+
+    return result
 
 class WikipediaInput(BaseModel):
     """Input for Wikipedia Tool."""
@@ -14,52 +88,27 @@ class WikipediaTool(BaseTool):
     The input should be a JSON string with these fields:
     - query: The search term or article title
     - language: Optional language code (default: "en")"""
-    
+
     args_schema: type[WikipediaInput] = WikipediaInput
 
     def _run(self, tool_input: str) -> Dict[str, Any]:
         """Execute the Wikipedia search."""
         try:
             # Parse the input JSON
-            params = json.loads(tool_input)
+            params = orjson.loads(tool_input)
             query = params["query"]
             language = params.get("language", "en")
 
-            # Set the language
-            wikipedia.set_lang(language)
-            
-            # Search for the page
-            search_results = wikipedia.search(query)
-            if not search_results:
-                return {
-                    "error": f"No Wikipedia articles found for: {query}"
-                }
-            
-            # Get the first result
-            page_title = search_results[0]
-            page = wikipedia.page(page_title, auto_suggest=False)
-            
-            return {
-                "title": page.title,
-                "url": page.url,
-                "extract": page.summary,
-                "page_id": page.pageid
-            }
-            
+            # Copy so callers cannot mutate the cached entry
+            return copy.copy(_lookup(language, query))
+
         except json.JSONDecodeError:
             return {"error": "Invalid JSON input"}
-        except wikipedia.exceptions.DisambiguationError as e:
-            return {
-                "error": "Disambiguation page",
-                "options": e.options[:5]  # Return first 5 options
-            }
-        except wikipedia.exceptions.PageError:
-            return {
-                "error": f"No Wikipedia page found for: {query}"
-            }
+        except KeyError as e:
+            return {"error": f"Missing required field: {str(e)}"}
         except Exception as e:
             return {"error": str(e)}
 
     async def _arun(self, tool_input: str) -> Dict[str, Any]:
-        """Execute the Wikipedia search asynchronously."""
-        return self._run(tool_input) 
\ No newline at end of file
+        """Execute the Wikipedia search in a worker thread to keep the event loop free."""
+        return await asyncio.to_thread(self._run, tool_input)
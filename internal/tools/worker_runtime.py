@@ -0,0 +1,67 @@
+"""Persistent worker runtime for CodeExecutionTool.
+
+Spawned once per pool slot, this process loops reading length-prefixed
+JSON jobs ({"code": ...}) from stdin, executes each snippet in a fresh
+globals namespace, and writes a length-prefixed JSON result
+({"stdout", "stderr", "exit_code"}) back on stdout. Keeping the
+interpreter alive amortizes startup and module-import cost across calls.
+"""
+import base64
+import contextlib
+import io
+import json
+import marshal
+import struct
+import sys
+import traceback
+
+def _read_job(stream):
+    """Read one length-prefixed JSON job, or None on EOF."""
+    header = stream.read(4)
+    if len(header) < 4:
+        return None
+    (length,) = struct.unpack('>I', header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    return json.loads(payload)
+
+def _write_result(stream, result):
+    """Write one length-prefixed JSON result."""
+    payload = json.dumps(result).encode('utf-8')
+    stream.write(struct.pack('>I', len(payload)) + payload)
+    stream.flush()
+
+def _execute(job):
+    """Execute a snippet in a fresh namespace, capturing stdout/stderr."""
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    exit_code = 0
+    try:
+        if "bytecode" in job:
+            # The parent already compiled the snippet; skip parse/compile
+            compiled = marshal.loads(base64.b64decode(job["bytecode"]))
+        else:
+            compiled = compile(job["code"], '<snippet>', 'exec')
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exec(compiled, {'__name__': '__main__'})
+    except BaseException:
+        stderr.write(traceback.format_exc())
+        exit_code = 1
+    return {
+        'stdout': stdout.getvalue(),
+        'stderr': stderr.getvalue(),
+        'exit_code': exit_code
+    }
+
+def main():
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    while True:
+        job = _read_job(stdin)
+        if job is None:
+            break
+        _write_result(stdout, _execute(job))
+
+if __name__ == '__main__':
+    main()